@@ -0,0 +1,24 @@
+"""Run the Chat API server with uvicorn."""
+
+import uvicorn
+
+from .config import settings
+
+
+def main() -> None:
+    """Start the API server.
+
+    The "auto" loop selects uvloop, which ships with uvicorn[standard], and
+    falls back to the stdlib asyncio loop on platforms without it.
+    """
+    uvicorn.run(
+        "chat_api.api:app",
+        host=settings.host,
+        port=settings.port,
+        log_level=settings.log_level.lower(),
+        loop="auto",
+    )
+
+
+if __name__ == "__main__":
+    main()
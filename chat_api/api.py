@@ -80,6 +80,7 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown components
+    await _chat_service.drain()
     await repository.shutdown()
     await cache.shutdown()
     _chat_service = None
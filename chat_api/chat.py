@@ -1,7 +1,9 @@
 """Chat service core business logic and models."""
 
+import asyncio
 import re
 import uuid
+from collections.abc import Coroutine
 from datetime import datetime
 from typing import Any
 
@@ -9,11 +11,15 @@ from loguru import logger
 from pydantic import BaseModel, Field, field_validator
 from pydantic_core import PydanticCustomError
 
+from .config import settings
 from .exceptions import LLMProviderError, StorageError, ValidationError
 from .providers import LLMProvider
-from .storage import Cache, Repository, cache_key
+from .storage import Cache, Repository, cache_key, history_cache_key
 from .types import ChatResult, HealthStatus, MessageRecord
 
+# Past this many in-flight cache writes, new writes are awaited inline instead
+MAX_PENDING_CACHE_WRITES = 256
+
 
 def sanitize_user_id(user_id: str) -> str:
     """Sanitize user ID for safe storage and logging."""
@@ -105,6 +111,7 @@ class ChatService:
         self.repository = repository
         self.cache = cache
         self.llm_provider = llm_provider
+        self._background_tasks: set[asyncio.Task[None]] = set()
 
     async def process_message(
         self,
@@ -150,6 +157,9 @@ class ChatService:
             )
             raise StorageError(f"Failed to save message: {e}") from e
 
+        # Awaited so the user's next history request already misses the stale entry
+        await self._try_cache_delete(history_cache_key(user_id))
+
         if llm_response.usage:
             logger.info(
                 "Token usage",
@@ -170,13 +180,34 @@ class ChatService:
             "usage": llm_response.usage,
         }
 
-        await self._try_cache_set(key, dict(result))
+        # Caching is best-effort, so don't hold the response on the round trip
+        await self._run_in_background(self._try_cache_set(key, dict(result)))
 
         return result
 
     async def get_history(self, user_id: str, limit: int = 10) -> list[MessageRecord]:
-        """Retrieve chat history for a user."""
-        return await self.repository.get_history(user_id, limit)
+        """Retrieve chat history for a user.
+
+        The most recent fetch is cached per user and reused for any request it
+        covers: one with a smaller limit, or any limit once the user's whole
+        history fits. Saving a message invalidates it.
+        """
+        ttl = settings.history_cache_ttl_seconds
+        if ttl <= 0:
+            return await self.repository.get_history(user_id, limit)
+
+        key = history_cache_key(user_id)
+        cached = await self._try_cache_get(key)
+        if cached:
+            messages: list[MessageRecord] = cached["messages"]
+            if limit <= cached["limit"] or len(messages) < cached["limit"]:
+                return messages[:limit]
+
+        messages = await self.repository.get_history(user_id, limit)
+        await self._run_in_background(
+            self._try_cache_set(key, {"limit": limit, "messages": messages}, ttl)
+        )
+        return messages
 
     async def health_check(self) -> HealthStatus:
         """Check health of all components."""
@@ -192,6 +223,29 @@ class ChatService:
             "cache": cache_ok,
         }
 
+    async def drain(self) -> None:
+        """Wait for pending background cache writes to finish."""
+        if self._background_tasks:
+            await asyncio.gather(*self._background_tasks)
+
+    async def _run_in_background(self, coro: Coroutine[Any, Any, None]) -> None:
+        """Schedule a best-effort coroutine without waiting for it.
+
+        Under Lambda the coroutine is awaited inline: the runtime freezes the
+        process once the handler returns, and Mangum runs without a lifespan,
+        so drain() would never flush tasks left behind.
+        """
+        if (
+            settings.is_lambda_environment
+            or len(self._background_tasks) >= MAX_PENDING_CACHE_WRITES
+        ):
+            await coro
+            return
+
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
     async def _try_cache_get(self, key: str) -> dict[str, Any] | None:
         """Try to get from cache with graceful fallback."""
         try:
@@ -200,14 +254,21 @@ class ChatService:
             logger.warning(f"Cache get failed (non-critical): {e}")
             return None
 
-    async def _try_cache_set(self, key: str, value: dict[str, Any]) -> None:
+    async def _try_cache_set(self, key: str, value: dict[str, Any], ttl: int | None = None) -> None:
         """Try to set cache with graceful fallback."""
         try:
             cache_data = {k: v for k, v in value.items() if k != "usage"}
-            await self.cache.set(key, cache_data)
+            await self.cache.set(key, cache_data, ttl)
         except Exception as e:  # noqa: BLE001
             logger.warning(f"Cache set failed (non-critical): {e}")
 
+    async def _try_cache_delete(self, key: str) -> None:
+        """Try to delete from cache with graceful fallback."""
+        try:
+            await self.cache.delete(key)
+        except Exception as e:  # noqa: BLE001
+            logger.warning(f"Cache delete failed (non-critical): {e}")
+
     async def _check_storage_health(self) -> bool:
         """Check storage health."""
         try:
@@ -25,6 +25,7 @@ class Settings(BaseSettings):
 
     database_url: str = "sqlite+aiosqlite:///./data/chat.db"
     redis_url: str | None = None
+    redis_max_connections: int = 64
 
     aws_region: str = "us-east-1"
     dynamodb_table: str = "chat-interactions"
@@ -39,6 +40,7 @@ class Settings(BaseSettings):
     # Cache settings
     cache_ttl_seconds: int = 3600
     cache_max_size: int = 1000
+    history_cache_ttl_seconds: int = 30  # 0 disables history caching
 
     # Model settings
     gemini_model: str = "gemini/gemini-1.5-flash-latest"
@@ -46,6 +48,7 @@ class Settings(BaseSettings):
 
     # DynamoDB settings
     dynamodb_ttl_days: int = 30
+    dynamodb_max_pool_connections: int = 50
 
     @property
     def is_lambda_environment(self) -> bool:
@@ -1,5 +1,6 @@
 """LLM Provider abstractions using Strategy Pattern."""
 
+import os
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import Any, Protocol
@@ -14,8 +15,6 @@ from .types import TokenUsage
 
 def setup_litellm() -> None:
     """Setup litellm configuration."""
-    import os
-
     litellm.set_verbose = False
     litellm.drop_params = True
     litellm.suppress_debug_info = True
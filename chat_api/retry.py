@@ -1,50 +1,61 @@
-"""Retry logic for the Chat API using tenacity."""
+"""Retry logic for the Chat API."""
 
+import asyncio
 from collections.abc import Callable
 from functools import wraps
 from typing import Any, TypeVar
 
 from loguru import logger
-from tenacity import (
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
 
 F = TypeVar("F", bound=Callable[..., Any])
 
+RETRYABLE_ERRORS = (TimeoutError, ConnectionError)
+
 
 def with_llm_retry(
     provider_name: str,
     max_retries: int = 3,
+    min_wait: float = 1.0,
+    max_wait: float = 10.0,
 ) -> Callable[[F], F]:
     """Decorator to add retry logic to LLM provider methods.
 
+    Retries on timeouts and connection errors with exponential backoff. The
+    loop is inlined so the success path costs a single extra await.
+
     Args:
         provider_name: Name of the provider for logging
-        max_retries: Maximum number of retry attempts
+        max_retries: Maximum number of attempts
+        min_wait: Delay in seconds before the first retry
+        max_wait: Upper bound for the delay between retries
 
     Returns:
         Decorated function with retry logic
 
+    Raises:
+        ValueError: If max_retries is less than 1
+
     """
+    if max_retries < 1:
+        raise ValueError(f"max_retries must be at least 1, got {max_retries}")
 
     def decorator(func: F) -> F:
-        @retry(
-            retry=retry_if_exception_type((TimeoutError, ConnectionError)),
-            stop=stop_after_attempt(max_retries),
-            wait=wait_exponential(multiplier=1, min=1, max=10),
-            before_sleep=lambda retry_state: logger.warning(
-                f"Retry attempt {retry_state.attempt_number}/{max_retries}: "
-                f"{type(retry_state.outcome.exception()).__name__ if retry_state.outcome else 'Unknown error'}"
-                f" (Provider: {provider_name})",
-            ),
-        )
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            delay = min_wait
+            for attempt in range(1, max_retries):
+                try:
+                    return await func(*args, **kwargs)
+                except RETRYABLE_ERRORS as e:
+                    logger.warning(
+                        f"Retry attempt {attempt}/{max_retries}: "
+                        f"{type(e).__name__} (Provider: {provider_name})"
+                    )
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_wait)
+            # Final attempt: its error, if any, propagates to the caller unchanged
             return await func(*args, **kwargs)
 
-        return wrapper  # type: ignore[return-value,no-any-return]
+        return wrapper  # type: ignore[return-value]
 
     return decorator
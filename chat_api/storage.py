@@ -1,18 +1,27 @@
 """Storage layer implementations for chat API."""
 
-import json
+import asyncio
+import hashlib
+import heapq
 import time
+from collections import OrderedDict
+from collections.abc import Callable
+from contextlib import AsyncExitStack, suppress
 from datetime import UTC, datetime
-from typing import Any, Protocol
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Protocol
 from urllib.parse import parse_qs, urlparse
 
-import aiosqlite
+import orjson
 from loguru import logger
 
 from .config import settings
 from .exceptions import StorageError
 from .types import MessageRecord
 
+if TYPE_CHECKING:
+    import aiosqlite
+
 
 class Repository(Protocol):
     """Storage repository protocol."""
@@ -31,60 +40,130 @@ class Cache(Protocol):
     async def shutdown(self) -> None: ...
     async def get(self, key: str) -> dict[str, Any] | None: ...
     async def set(self, key: str, value: dict[str, Any], ttl: int | None = None) -> None: ...
+    async def delete(self, key: str) -> None: ...
 
 
 def cache_key(user_id: str, content: str) -> str:
     """Generate cache key from user ID and content hash."""
-    import hashlib
-
-    content_hash = hashlib.md5(content.encode(), usedforsecurity=False).hexdigest()[:16]  # nosec B324
+    # blake2b with an 8-byte digest is faster than MD5 and yields the same 16 hex chars
+    content_hash = hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
     return f"{user_id}:{content_hash}"
 
 
+def history_cache_key(user_id: str) -> str:
+    """Generate the cache key holding a user's recent history."""
+    # Content hashes are 16 hex chars, so this can never collide with cache_key
+    return f"{user_id}:history"
+
+
+# Expiry clock for in-process caches and health checks. Tests patch this rather
+# than time.monotonic, which asyncio's event loop also reads.
+_monotonic = time.monotonic
+
+# Longest the in-memory reaper sleeps, so entries with a shorter TTL set while it
+# waits are still swept promptly
+INMEMORY_REAP_INTERVAL_SECONDS = 30.0
+
+
 class InMemoryCache:
-    """Simple in-memory cache using Python's dict."""
+    """In-memory LRU cache with per-entry TTL.
+
+    An OrderedDict keeps entries in recency order, so hits and evictions are
+    O(1). A min-heap of expiry times lets a background reaper drop expired
+    entries without scanning the whole cache.
+    """
 
     def __init__(self, max_size: int | None = None) -> None:
-        self.cache: dict[str, tuple[dict[str, Any], float]] = {}
+        self.cache: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
         self.max_size = max_size or settings.cache_max_size
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._reaper_task: asyncio.Task[None] | None = None
         logger.info(f"In-memory cache initialized with max size {self.max_size}")
 
     async def startup(self) -> None:
-        """Initialize cache."""
-        pass
+        """Start the background reaper for expired entries."""
+        if self._reaper_task is None:
+            self._reaper_task = asyncio.create_task(self._reap())
 
     async def shutdown(self) -> None:
-        """Cleanup cache."""
-        self.cache.clear()
+        """Stop the reaper and clear the cache."""
+        if self._reaper_task:
+            self._reaper_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._reaper_task
+            self._reaper_task = None
+        self.clear()
 
     async def get(self, key: str) -> dict[str, Any] | None:
         """Get value from cache if not expired."""
-        if key not in self.cache:
-            logger.debug(f"Cache miss: {key}")
+        entry = self.cache.get(key)
+        if entry is None:
+            logger.debug("Cache miss: {}", key)
             return None
 
-        data, expiry_time = self.cache[key]
-
-        if time.time() > expiry_time:
-            del self.cache[key]
-            logger.debug(f"Cache expired: {key}")
+        data, expiry_time = entry
+        if _monotonic() > expiry_time:
+            self.cache.pop(key, None)
+            logger.debug("Cache expired: {}", key)
             return None
 
-        logger.debug(f"Cache hit: {key}")
+        self.cache.move_to_end(key)
+        logger.debug("Cache hit: {}", key)
         return data
 
     async def set(self, key: str, value: dict[str, Any], ttl: int | None = None) -> None:
-        """Set value in cache with TTL."""
+        """Set value in cache with TTL, evicting the least recently used entry when full."""
         ttl = ttl or settings.cache_ttl_seconds
 
-        if len(self.cache) >= self.max_size and key not in self.cache:
-            oldest_key = next(iter(self.cache))
-            del self.cache[oldest_key]
-            logger.debug(f"Evicted oldest: {oldest_key}")
-
-        expiry_time = time.time() + ttl
+        expiry_time = _monotonic() + ttl
         self.cache[key] = (value, expiry_time)
-        logger.debug(f"Cached: {key} (size: {len(self.cache)}/{self.max_size}, TTL: {ttl}s)")
+        self.cache.move_to_end(key)
+        if len(self.cache) > self.max_size:
+            evicted_key, _ = self.cache.popitem(last=False)
+            logger.debug("Evicted least recently used: {}", evicted_key)
+
+        heapq.heappush(self._expiry_heap, (expiry_time, key))
+        # Overwritten and evicted keys leave stale heap entries; rebuild before they pile up
+        if len(self._expiry_heap) > 2 * self.max_size:
+            self._expiry_heap = [(expiry, k) for k, (_, expiry) in self.cache.items()]
+            heapq.heapify(self._expiry_heap)
+
+        logger.debug("Cached: {} (size: {}/{}, TTL: {}s)", key, len(self.cache), self.max_size, ttl)
+
+    async def delete(self, key: str) -> None:
+        """Remove a key from the cache if present."""
+        # Its heap entry is skipped by the reaper once the key is gone
+        if self.cache.pop(key, None) is not None:
+            logger.debug("Cache deleted: {}", key)
+
+    def reap_expired(self) -> int:
+        """Remove expired entries, touching only those at the front of the heap.
+
+        Returns:
+            Number of entries removed.
+        """
+        now = _monotonic()
+        heap = self._expiry_heap
+        removed = 0
+        while heap and heap[0][0] <= now:
+            expiry_time, key = heapq.heappop(heap)
+            entry = self.cache.get(key)
+            # Skip heap entries left behind by a later set() of the same key
+            if entry is not None and entry[1] == expiry_time:
+                del self.cache[key]
+                removed += 1
+        return removed
+
+    async def _reap(self) -> None:
+        """Sleep until the next entry expires, then sweep expired entries."""
+        while True:
+            delay = INMEMORY_REAP_INTERVAL_SECONDS
+            if self._expiry_heap:
+                delay = min(max(self._expiry_heap[0][0] - _monotonic(), 0.0), delay)
+            await asyncio.sleep(delay)
+            removed = self.reap_expired()
+            if removed:
+                logger.debug("Reaped {} expired cache entries", removed)
 
     def size(self) -> int:
         """Get current cache size."""
@@ -93,15 +172,34 @@ class InMemoryCache:
     def clear(self) -> None:
         """Clear all cached items."""
         self.cache.clear()
+        self._expiry_heap.clear()
         logger.debug("Cache cleared")
 
 
+L1_CACHE_MAX_SIZE = 1024
+L1_CACHE_TTL_SECONDS = 1.0
+# Lookups that arrive while another is in flight wait this long to share one MGET.
+# A lone lookup never waits; only callers that would overlap pay the window.
+REDIS_GET_BATCH_WINDOW_SECONDS = 0.001
+
+# How long a health probe result is reused before the backend is queried again
+SQLITE_HEALTH_TTL_SECONDS = 1.0
+DYNAMODB_HEALTH_TTL_SECONDS = 5.0
+
+
 class RedisCache:
-    """Redis cache implementation."""
+    """Redis cache implementation with a short-lived in-process L1."""
 
     def __init__(self, redis_url: str) -> None:
         self.redis_url = redis_url
         self.client: Any = None
+        # Absorbs repeated lookups of a hot key (retries, fan-out) without a round trip.
+        # Holds the serialized payload so every hit decodes a fresh dict for its caller.
+        self._l1: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        # Lookups issued while another is in flight, flushed together in one MGET
+        self._lookups_in_flight = 0
+        self._pending_gets: dict[str, list[asyncio.Future[bytes | None]]] = {}
+        self._flush_task: asyncio.Task[None] | None = None
         logger.info(f"Redis cache configured: {redis_url}")
 
     async def startup(self) -> None:
@@ -109,7 +207,16 @@ class RedisCache:
         import redis.asyncio as redis
 
         try:
-            self.client = await redis.from_url(self.redis_url)
+            # Bounded pool with TCP keepalive so idle sockets survive NAT timeouts
+            # and bursts reuse connections instead of opening new ones
+            self.client = await redis.from_url(
+                self.redis_url,
+                decode_responses=False,  # orjson parses the raw bytes directly
+                max_connections=settings.redis_max_connections,
+                socket_keepalive=True,
+                health_check_interval=30,
+                retry_on_timeout=True,
+            )
             await self.client.ping()
             logger.info("Redis cache connected successfully")
         except (ConnectionError, TimeoutError, OSError) as e:
@@ -118,9 +225,13 @@ class RedisCache:
 
     async def shutdown(self) -> None:
         """Close Redis connection."""
+        self._l1.clear()
+        if self._flush_task:
+            await self._flush_task
         if self.client:
             try:
-                await self.client.close()
+                # aclose() also disconnects the pool that from_url created for this client
+                await self.client.aclose()
                 logger.info("Redis connection closed")
             except (ConnectionError, TimeoutError, OSError) as e:
                 logger.warning(f"Error closing Redis connection: {e}")
@@ -130,32 +241,174 @@ class RedisCache:
         if not self.client:
             raise RuntimeError("Redis client not initialized - call startup() first")
 
+        entry = self._l1.get(key)
+        if entry is not None:
+            if _monotonic() < entry[1]:
+                return orjson.loads(entry[0])  # type: ignore[no-any-return]
+            del self._l1[key]
+
         try:
-            data = await self.client.get(key)
+            data = await self._fetch(key)
             if data:
-                result = json.loads(data)
-                logger.debug(f"Redis cache hit: {key}")
+                result = orjson.loads(data)
+                self._remember(key, data)
+                logger.debug("Redis cache hit: {}", key)
                 return result  # type: ignore[no-any-return]
-        except (json.JSONDecodeError, ConnectionError, TimeoutError) as e:
+        except (orjson.JSONDecodeError, ConnectionError, TimeoutError) as e:
             logger.error(f"Redis get error for key {key}: {e}")
             raise
         else:
-            logger.debug(f"Redis cache miss: {key}")
+            logger.debug("Redis cache miss: {}", key)
             return None
 
-    async def set(self, key: str, value: dict[str, Any], ttl: int = 3600) -> None:
+    async def set(self, key: str, value: dict[str, Any], ttl: int | None = None) -> None:
         """Set value in Redis with TTL."""
         if not self.client:
             raise RuntimeError("Redis client not initialized - call startup() first")
 
+        ttl = ttl or settings.cache_ttl_seconds
         try:
-            serialized = json.dumps(value)
+            # orjson emits UTF-8 bytes, which redis-py sends without re-encoding
+            serialized = orjson.dumps(value)
             await self.client.setex(key, ttl, serialized)
-            logger.debug(f"Redis cached: {key} (TTL: {ttl}s)")
-        except (json.JSONDecodeError, ConnectionError, TimeoutError) as e:
+            self._remember(key, serialized)
+            logger.debug("Redis cached: {} (TTL: {}s)", key, ttl)
+        except (orjson.JSONEncodeError, ConnectionError, TimeoutError) as e:
+            self._l1.pop(key, None)
             logger.error(f"Redis set error for key {key}: {e}")
             raise
 
+    async def delete(self, key: str) -> None:
+        """Delete a key from Redis and the local L1."""
+        if not self.client:
+            raise RuntimeError("Redis client not initialized - call startup() first")
+
+        self._l1.pop(key, None)
+        try:
+            await self.client.delete(key)
+            logger.debug("Redis deleted: {}", key)
+        except (ConnectionError, TimeoutError) as e:
+            logger.error(f"Redis delete error for key {key}: {e}")
+            raise
+
+    async def _fetch(self, key: str) -> bytes | None:
+        """Fetch a raw value, coalescing lookups that overlap an in-flight one.
+
+        A lookup with nothing else in flight goes straight to Redis, so an
+        uncontended miss pays no batching delay. Lookups arriving while one is
+        outstanding are queued and flushed together after a short window.
+        """
+        if not self._lookups_in_flight:
+            self._lookups_in_flight += 1
+            try:
+                return await self.client.get(key)  # type: ignore[no-any-return]
+            finally:
+                self._lookups_in_flight -= 1
+
+        future: asyncio.Future[bytes | None] = asyncio.get_running_loop().create_future()
+        self._pending_gets.setdefault(key, []).append(future)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_gets())
+        return await future
+
+    async def _flush_gets(self) -> None:
+        """Resolve every queued lookup with a single GET or MGET round trip."""
+        await asyncio.sleep(REDIS_GET_BATCH_WINDOW_SECONDS)
+        pending, self._pending_gets = self._pending_gets, {}
+        self._flush_task = None
+
+        keys = list(pending)
+        self._lookups_in_flight += 1
+        try:
+            if len(keys) == 1:
+                values = [await self.client.get(keys[0])]
+            else:
+                values = await self.client.mget(keys)
+                logger.debug("Redis batched {} lookups into one MGET", len(keys))
+        except Exception as e:  # noqa: BLE001
+            # Every waiter sees the failure and logs it from its own get()
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        finally:
+            self._lookups_in_flight -= 1
+
+        for key, value in zip(keys, values, strict=True):
+            for future in pending[key]:
+                if not future.done():
+                    future.set_result(value)
+
+    def _remember(self, key: str, data: bytes) -> None:
+        """Store a serialized value in the L1 cache, evicting the oldest entry when full."""
+        self._l1[key] = (data, _monotonic() + L1_CACHE_TTL_SECONDS)
+        self._l1.move_to_end(key)
+        if len(self._l1) > L1_CACHE_MAX_SIZE:
+            self._l1.popitem(last=False)
+
+
+# WAL lets reads run alongside the writer and, with synchronous=NORMAL, fsyncs
+# at checkpoints instead of every commit. A power loss can drop only the last
+# few transactions, which is acceptable for chat history. Mapping the first
+# 256 MiB of the file lets history reads use the OS page cache directly
+# instead of a read() per page.
+_SQLITE_FILE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+)
+
+# A 64 MiB page cache (default is 2 MiB) keeps recent history pages in memory,
+# and temp_store=MEMORY keeps transient sort and index b-trees off disk
+_SQLITE_PRAGMAS = (
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Rows per write transaction; SQLite has no hard cap, this bounds commit latency
+_SQLITE_BATCH_LIMIT = 64
+
+# Insert parameters waiting in the write queue, and the future its save() awaits
+_PendingInsert = tuple[tuple[Any, ...], asyncio.Future[None]]
+
+# Fixed statements keep a stable key in sqlite3's per-connection statement cache
+_INSERT_SQL = """
+    INSERT INTO chat_history (id, user_id, content, response, model, usage)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_HISTORY_SQL = """
+    SELECT id, user_id, content, response, model, usage, timestamp
+    FROM chat_history
+    WHERE user_id = ?
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+
+
+def _dumps_usage(usage: dict[str, Any]) -> str:
+    """Serialize token usage; orjson is several times faster than json.dumps."""
+    # default=str keeps Decimal costs and other non-JSON scalars as strings
+    return orjson.dumps(usage, default=str).decode()
+
+
+def _datetime_to_iso(value: datetime) -> str:
+    """Format a datetime column value as ISO 8601."""
+    return value.isoformat()
+
+
+def _text_to_iso(value: Any) -> str:
+    """Format a text column value, mapping NULL to an empty string."""
+    return str(value) if value else ""
+
+
+def _epoch_ms_to_iso(value: Any) -> str:
+    """Format an epoch-milliseconds attribute as ISO 8601, mapping missing to empty."""
+    if not value:
+        return ""
+    return datetime.fromtimestamp(int(value) / 1000, UTC).isoformat()
+
 
 class SQLiteRepository:
     """SQLite repository with async aiosqlite."""
@@ -167,12 +420,25 @@ class SQLiteRepository:
         else:
             self.db_path = database_url.replace("sqlite+aiosqlite://", "").replace("sqlite://", "")
         self.connection: aiosqlite.Connection | None = None
+        self._write_queue: asyncio.Queue[_PendingInsert] | None = None
+        self._writer_task: asyncio.Task[None] | None = None
+        self._health_cache: tuple[float, bool] = (0.0, False)
         logger.info(f"SQLite repository configured: {self.db_path}")
 
     async def startup(self) -> None:
         """Initialize database connection and create tables."""
+        import aiosqlite
+
+        # Rows stay plain tuples; get_history unpacks them in _HISTORY_SQL column order
         self.connection = await aiosqlite.connect(self.db_path)
-        self.connection.row_factory = aiosqlite.Row
+
+        pragmas: tuple[str, ...] = _SQLITE_PRAGMAS
+        # WAL and mmap only apply to file-backed databases
+        if self.db_path != ":memory:":
+            pragmas = _SQLITE_FILE_PRAGMAS + pragmas
+        for pragma in pragmas:
+            async with self.connection.execute(pragma):
+                pass
 
         async with self.connection.execute("""
             CREATE TABLE IF NOT EXISTS chat_history (
@@ -187,44 +453,108 @@ class SQLiteRepository:
 """) as cursor:
             await cursor.close()
 
+        # The index carries every column _HISTORY_SQL selects, so get_history
+        # is answered from the index alone without a table lookup per row
         async with self.connection.execute("""
-            CREATE INDEX IF NOT EXISTS idx_user_id
-            ON chat_history(user_id, timestamp)
+            CREATE INDEX IF NOT EXISTS idx_history_cover
+            ON chat_history(user_id, timestamp DESC, id, content, response, model, usage)
         """) as cursor:
             await cursor.close()
 
+        # Superseded by idx_history_cover; drop it from databases created earlier
+        async with self.connection.execute("DROP INDEX IF EXISTS idx_user_id") as cursor:
+            await cursor.close()
+
         await self.connection.commit()
+
+        self._write_queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(
+            self._write_loop(self.connection, self._write_queue)
+        )
         logger.info("SQLite repository initialized")
 
     async def shutdown(self) -> None:
-        """Close database connection."""
+        """Flush pending inserts and close the database connection."""
+        if self._writer_task and self._write_queue:
+            await self._write_queue.join()
+            self._writer_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._writer_task
+            self._writer_task = None
+            self._write_queue = None
+
         if self.connection:
             await self.connection.close()
             self.connection = None
 
     async def save(self, **kwargs) -> None:
-        """Save message to database."""
-        if not self.connection:
+        """Save message to database.
+
+        Inserts are queued for the background writer, which commits concurrent
+        saves together in one transaction. Returns once this row is committed.
+        """
+        if not self.connection or not self._write_queue:
             raise StorageError("Database connection not initialized")
 
-        usage_json = json.dumps(kwargs.get("usage", {})) if kwargs.get("usage") else None
+        usage = kwargs.get("usage")
+        usage_json = _dumps_usage(usage) if usage else None
+        params = (
+            kwargs["id"],
+            kwargs["user_id"],
+            kwargs["content"],
+            kwargs["response"],
+            kwargs.get("model"),
+            usage_json,
+        )
 
-        async with self.connection.execute(
-            """
-            INSERT INTO chat_history (id, user_id, content, response, model, usage)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                kwargs["id"],
-                kwargs["user_id"],
-                kwargs["content"],
-                kwargs["response"],
-                kwargs.get("model"),
-                usage_json,
-            ),
-        ) as cursor:
-            await cursor.close()
-        await self.connection.commit()
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        await self._write_queue.put((params, future))
+        await future
+
+    async def _write_loop(
+        self, connection: "aiosqlite.Connection", queue: asyncio.Queue[_PendingInsert]
+    ) -> None:
+        """Drain queued inserts into transactions of up to _SQLITE_BATCH_LIMIT rows.
+
+        Like the DynamoDB writer, a batch takes whatever is already queued, so a
+        lone save commits immediately and a burst shares one commit (and fsync).
+        """
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < _SQLITE_BATCH_LIMIT and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._insert_batch(connection, batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _insert_batch(
+        self, connection: "aiosqlite.Connection", batch: list[_PendingInsert]
+    ) -> None:
+        """Insert a batch in one transaction and resolve each save's future."""
+        import aiosqlite
+
+        try:
+            async with connection.executemany(
+                _INSERT_SQL, [params for params, _ in batch]
+            ) as cursor:
+                await cursor.close()
+            await connection.commit()
+        except aiosqlite.Error as e:
+            await connection.rollback()
+            if len(batch) == 1:
+                batch[0][1].set_exception(e)
+                return
+            # One bad row (e.g. a duplicate id) aborts the whole transaction, so
+            # insert rows one by one to fail only the save that caused it
+            logger.warning(f"SQLite batch insert failed, inserting rows singly: {e}")
+            for pending in batch:
+                await self._insert_batch(connection, [pending])
+        else:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
 
     async def get_history(self, user_id: str, limit: int = 10) -> list[MessageRecord]:
         """Get chat history for a user."""
@@ -232,48 +562,117 @@ class SQLiteRepository:
             raise StorageError("Database connection not initialized")
 
         async with self.connection.execute(
-            """
-            SELECT id, user_id, content, response, model, usage, timestamp
-            FROM chat_history
-            WHERE user_id = ?
-            ORDER BY timestamp DESC
-            LIMIT ?
-            """,
+            _HISTORY_SQL,
             (user_id, limit),
         ) as cursor:
-            rows = await cursor.fetchall()
-
-        results: list[MessageRecord] = []
-        for row in rows:
-            record: MessageRecord = {
-                "id": row["id"],
-                "user_id": row["user_id"],
-                "content": row["content"],
-                "response": row["response"],
-                "model": row["model"],
-                "usage": json.loads(row["usage"]) if row["usage"] else None,
-                "timestamp": row["timestamp"].isoformat()
-                if hasattr(row["timestamp"], "isoformat")
-                else str(row["timestamp"])
-                if row["timestamp"]
-                else "",
+            rows = list(await cursor.fetchall())
+
+        if not rows:
+            return []
+
+        # All rows share a column type, so resolve the timestamp conversion once
+        to_iso = _datetime_to_iso if hasattr(rows[0][6], "isoformat") else _text_to_iso
+
+        loads = orjson.loads
+        return [
+            {
+                "id": id_,
+                "user_id": user_id_,
+                "content": content,
+                "response": response,
+                "model": model,
+                "usage": loads(usage) if usage else None,
+                "timestamp": to_iso(timestamp),
             }
-            results.append(record)
-        return results
+            for id_, user_id_, content, response, model, usage, timestamp in rows
+        ]
 
     async def health_check(self) -> bool:
         """Check database health."""
         if not self.connection:
             return False
 
+        checked_at, healthy = self._health_cache
+        now = _monotonic()
+        if checked_at and now - checked_at < SQLITE_HEALTH_TTL_SECONDS:
+            return healthy
+
+        import aiosqlite
+
         try:
             async with self.connection.execute("SELECT 1") as cursor:
                 await cursor.fetchone()
         except (ConnectionError, TimeoutError, OSError, aiosqlite.Error) as e:
             logger.error(f"Database health check failed: {e}")
-            return False
+            healthy = False
         else:
-            return True
+            healthy = True
+        self._health_cache = (now, healthy)
+        return healthy
+
+
+_BATCH_WRITE_LIMIT = 25  # BatchWriteItem maximum
+_BATCH_WRITE_RETRIES = 4
+_BATCH_RETRY_BASE_DELAY = 0.05
+
+# A serialized item waiting in the write queue, and the future its save() awaits
+_PendingWrite = tuple[dict[str, Any], asyncio.Future[None]]
+
+
+def _serialize_value(value: Any) -> dict[str, Any]:
+    """Convert a Python value to a DynamoDB attribute value."""
+    try:
+        return _SERIALIZERS[type(value)](value)
+    except KeyError:
+        raise TypeError(f"Unsupported DynamoDB attribute type: {type(value).__name__}") from None
+
+
+def _parse_number(value: str) -> int | float:
+    """Parse a DynamoDB number, keeping integers exact."""
+    return int(value) if value.lstrip("-").isdigit() else float(value)
+
+
+def _deserialize_value(value: dict[str, Any]) -> Any:
+    """Convert a DynamoDB attribute value to a Python value."""
+    # Attribute values carry exactly one type tag
+    ((tag, raw),) = value.items()
+    return _DESERIALIZERS[tag](raw)
+
+
+# Keyed on the exact type (and type tag), so each attribute costs one dict lookup
+# instead of the isinstance chain in boto3's TypeSerializer/TypeDeserializer.
+# Numbers come back as int or float rather than Decimal, which JSON encodes natively.
+_SERIALIZERS: dict[type, Callable[[Any], dict[str, Any]]] = {
+    str: lambda v: {"S": v},
+    bool: lambda v: {"BOOL": v},
+    int: lambda v: {"N": str(v)},
+    float: lambda v: {"N": str(v)},
+    Decimal: lambda v: {"N": str(v)},
+    dict: lambda v: {"M": {k: _serialize_value(x) for k, x in v.items()}},
+    list: lambda v: {"L": [_serialize_value(x) for x in v]},
+    type(None): lambda v: {"NULL": True},
+}
+
+_DESERIALIZERS: dict[str, Callable[[Any], Any]] = {
+    "S": lambda v: v,
+    "N": _parse_number,
+    "BOOL": lambda v: v,
+    "NULL": lambda v: None,
+    "M": lambda v: {k: _deserialize_value(x) for k, x in v.items()},
+    "L": lambda v: [_deserialize_value(x) for x in v],
+}
+
+
+# Fetch only the MessageRecord fields (e.g. not ttl). Names are aliased because
+# several, like timestamp, are DynamoDB reserved words.
+_HISTORY_FIELDS = ("id", "user_id", "content", "response", "model", "usage", "timestamp")
+_HISTORY_ATTRIBUTE_NAMES = {f"#{field}": field for field in _HISTORY_FIELDS}
+_HISTORY_PROJECTION = ", ".join(_HISTORY_ATTRIBUTE_NAMES)
+
+
+def _item_key(item: dict[str, Any]) -> tuple[str, str]:
+    """Return the primary key of a serialized chat item."""
+    return item["user_id"]["S"], item["timestamp"]["N"]
 
 
 class DynamoDBRepository:
@@ -287,22 +686,48 @@ class DynamoDBRepository:
         self.region = params.get("region", ["us-east-1"])[0]
 
         self.session: Any = None
+        self.client: Any = None
+        self._exit_stack: AsyncExitStack | None = None
+        self._write_queue: asyncio.Queue[_PendingWrite] | None = None
+        self._writer_task: asyncio.Task[None] | None = None
+        self._health_cache: tuple[float, bool] = (0.0, False)
         logger.info(f"DynamoDB repository configured: {self.table_name} in {self.region}")
 
     async def startup(self) -> None:
-        """Initialize DynamoDB session."""
-        import aioboto3
-
-        self.session = aioboto3.Session()
-
+        """Initialize DynamoDB session and open a long-lived client."""
+        from aiobotocore.config import AioConfig
+        from aiobotocore.session import get_session
+
+        self.session = get_session()
+
+        # One client for the repository lifetime, so requests skip client setup and
+        # reuse the pooled TLS connections. botocore defaults to 10 pooled
+        # connections, too few for concurrent requests.
+        config = AioConfig(
+            max_pool_connections=settings.dynamodb_max_pool_connections,
+            retries={"max_attempts": 3, "mode": "adaptive"},
+        )
+        self._exit_stack = AsyncExitStack()
         try:
-            async with self.session.client("dynamodb", region_name=self.region) as client:
-                await client.describe_table(TableName=self.table_name)
+            self.client = await self._exit_stack.enter_async_context(
+                self.session.create_client("dynamodb", region_name=self.region, config=config)
+            )
+
+            try:
+                await self.client.describe_table(TableName=self.table_name)
                 logger.info(f"DynamoDB table {self.table_name} exists")
-        except Exception:  # noqa: BLE001
-            logger.info(f"Table {self.table_name} does not exist, creating")
-            async with self.session.client("dynamodb", region_name=self.region) as client:
-                await self._create_table_with_client(client)
+            except Exception:  # noqa: BLE001
+                logger.info(f"Table {self.table_name} does not exist, creating")
+                await self._create_table_with_client(self.client)
+        except BaseException:
+            # shutdown() is not called after a failed startup, so release the pool here
+            await self._exit_stack.aclose()
+            self._exit_stack = None
+            self.client = None
+            raise
+
+        self._write_queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._write_loop(self._write_queue))
 
     async def _create_table_with_client(self, client) -> None:
         """Create DynamoDB table if it doesn't exist."""
@@ -325,55 +750,174 @@ class DynamoDBRepository:
         logger.info(f"DynamoDB table {self.table_name} created")
 
     async def shutdown(self) -> None:
-        """Close session."""
-        pass
+        """Flush pending writes and close the DynamoDB client."""
+        if self._writer_task and self._write_queue:
+            await self._write_queue.join()
+            self._writer_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._writer_task
+            self._writer_task = None
+            self._write_queue = None
+
+        if self._exit_stack:
+            await self._exit_stack.aclose()
+            self._exit_stack = None
+        self.client = None
 
     async def save(self, **kwargs) -> None:
-        """Save message to DynamoDB."""
-        from boto3.dynamodb.types import TypeSerializer
+        """Save message to DynamoDB.
 
+        Items are queued for the background writer, which coalesces concurrent
+        saves into BatchWriteItem calls. Returns once this item is written.
+        """
+        if not self.client or not self._write_queue:
+            raise StorageError("DynamoDB client not initialized")
+
+        now_ms = time.time_ns() // 1_000_000  # one clock read, integer math only
         item = {
             "user_id": kwargs["user_id"],
-            "timestamp": int(time.time() * 1000),
+            "timestamp": now_ms,
             "id": kwargs["id"],
             "content": kwargs["content"],
             "response": kwargs["response"],
             "model": kwargs.get("model"),
             "usage": kwargs.get("usage"),
-            "ttl": int(time.time()) + 86400 * settings.dynamodb_ttl_days,
+            "ttl": now_ms // 1000 + 86400 * settings.dynamodb_ttl_days,
         }
 
-        serializer = TypeSerializer()
-        serialized_item = {k: serializer.serialize(v) for k, v in item.items() if v is not None}
-
-        async with self.session.client("dynamodb", region_name=self.region) as client:
-            await client.put_item(TableName=self.table_name, Item=serialized_item)
+        serialized_item = {k: _serialize_value(v) for k, v in item.items() if v is not None}
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        await self._write_queue.put((serialized_item, future))
+        await future
+
+    async def _write_loop(self, queue: asyncio.Queue[_PendingWrite]) -> None:
+        """Drain queued saves into batches of up to 25 items.
+
+        Batches take whatever is already queued rather than waiting for more,
+        so a lone save is written immediately and bursts share round trips.
+        BatchWriteItem rejects repeated keys, so a duplicate starts the next batch.
+        Each batch is sent from its own task, so a slow or retrying batch does
+        not hold up the next; the semaphore keeps them within the client pool.
+        """
+        semaphore = asyncio.Semaphore(settings.dynamodb_max_pool_connections)
+        in_flight: set[asyncio.Task[None]] = set()
+        carry: _PendingWrite | None = None
+        while True:
+            # Waiting for a slot first lets more saves queue up for this batch
+            await semaphore.acquire()
+            batch = [carry or await queue.get()]
+            carry = None
+            keys = {_item_key(batch[0][0])}
+            while len(batch) < _BATCH_WRITE_LIMIT and not queue.empty():
+                pending = queue.get_nowait()
+                key = _item_key(pending[0])
+                if key in keys:
+                    carry = pending
+                    break
+                keys.add(key)
+                batch.append(pending)
+
+            task = asyncio.create_task(self._send_batch(queue, batch, semaphore))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+
+    async def _send_batch(
+        self,
+        queue: asyncio.Queue[_PendingWrite],
+        batch: list[_PendingWrite],
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        """Write one batch and resolve the futures of the saves it carries."""
+        items = [item for item, _ in batch]
+        try:
+            try:
+                failed_ids = await self._write_batch(items)
+            except Exception as e:  # noqa: BLE001
+                # One bad item (e.g. over 400KB) fails the whole batch, so retry
+                # the items one by one to fail only the save that caused it
+                if len(items) > 1:
+                    logger.warning(f"DynamoDB batch write failed, writing items singly: {e}")
+                    results = await asyncio.gather(
+                        *(
+                            self.client.put_item(TableName=self.table_name, Item=item)
+                            for item in items
+                        ),
+                        return_exceptions=True,
+                    )
+                else:
+                    results = [e]
+                for (_, future), result in zip(batch, results, strict=True):
+                    if future.done():
+                        continue
+                    if isinstance(result, BaseException):
+                        logger.error(f"DynamoDB write failed: {result}")
+                        future.set_exception(StorageError(f"DynamoDB write failed: {result}"))
+                    else:
+                        future.set_result(None)
+            else:
+                for item, future in batch:
+                    if future.done():
+                        continue
+                    if item["id"]["S"] in failed_ids:
+                        future.set_exception(StorageError("DynamoDB write left unprocessed"))
+                    else:
+                        future.set_result(None)
+        finally:
+            semaphore.release()
+            for _ in batch:
+                queue.task_done()
+
+    async def _write_batch(self, items: list[dict[str, Any]]) -> set[str]:
+        """Write items with BatchWriteItem, retrying unprocessed ones.
+
+        Returns:
+            IDs of items DynamoDB still had not processed after all retries.
+        """
+        request_items = {self.table_name: [{"PutRequest": {"Item": item}} for item in items]}
+        delay = _BATCH_RETRY_BASE_DELAY
+
+        for attempt in range(_BATCH_WRITE_RETRIES):
+            response = await self.client.batch_write_item(RequestItems=request_items)
+            request_items = response.get("UnprocessedItems") or {}
+            if not request_items:
+                return set()
+            if attempt < _BATCH_WRITE_RETRIES - 1:
+                await asyncio.sleep(delay)
+                delay *= 2
+
+        unprocessed = request_items.get(self.table_name, [])
+        logger.error(f"DynamoDB left {len(unprocessed)} items unprocessed")
+        return {request["PutRequest"]["Item"]["id"]["S"] for request in unprocessed}
 
     async def get_history(self, user_id: str, limit: int = 10) -> list[MessageRecord]:
         """Get chat history from DynamoDB."""
-        from boto3.dynamodb.types import TypeDeserializer
-
-        async with self.session.client("dynamodb", region_name=self.region) as client:
-            response = await client.query(
-                TableName=self.table_name,
-                KeyConditionExpression="user_id = :user_id",
-                ExpressionAttributeValues={":user_id": {"S": user_id}},
-                ScanIndexForward=False,
-                Limit=limit,
-            )
+        if not self.client:
+            raise StorageError("DynamoDB client not initialized")
+
+        # A query page stops at 1MB, so long messages can need several pages.
+        # Each page depends on the previous LastEvaluatedKey, so they run in order.
+        query: dict[str, Any] = {
+            "TableName": self.table_name,
+            "KeyConditionExpression": "#user_id = :user_id",
+            "ProjectionExpression": _HISTORY_PROJECTION,
+            "ExpressionAttributeNames": _HISTORY_ATTRIBUTE_NAMES,
+            "ExpressionAttributeValues": {":user_id": {"S": user_id}},
+            "ScanIndexForward": False,
+        }
+        items: list[dict[str, Any]] = []
+        while True:
+            response = await self.client.query(**query, Limit=limit - len(items))
+            items.extend(response.get("Items", []))
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key or len(items) >= limit:
+                break
+            query["ExclusiveStartKey"] = last_key
 
-        deserializer = TypeDeserializer()
         results: list[MessageRecord] = []
 
-        for item in response.get("Items", []):
-            deserialized = {k: deserializer.deserialize(v) for k, v in item.items()}
-
-            timestamp_ms = deserialized.get("timestamp", 0)
-            if timestamp_ms:
-                dt = datetime.fromtimestamp(timestamp_ms / 1000, UTC)
-                timestamp_str = dt.isoformat()
-            else:
-                timestamp_str = ""
+        for item in items:
+            deserialized = {k: _deserialize_value(v) for k, v in item.items()}
 
             record: MessageRecord = {
                 "id": deserialized.get("id", ""),
@@ -382,7 +926,7 @@ class DynamoDBRepository:
                 "response": deserialized.get("response", ""),
                 "model": deserialized.get("model"),
                 "usage": deserialized.get("usage"),
-                "timestamp": timestamp_str,
+                "timestamp": _epoch_ms_to_iso(deserialized.get("timestamp")),
             }
             results.append(record)
 
@@ -390,19 +934,35 @@ class DynamoDBRepository:
 
     async def health_check(self) -> bool:
         """Check DynamoDB health."""
+        if not self.client:
+            return False
+
+        # Liveness probes would otherwise cost a DescribeTable call each
+        checked_at, healthy = self._health_cache
+        now = _monotonic()
+        if checked_at and now - checked_at < DYNAMODB_HEALTH_TTL_SECONDS:
+            return healthy
+
         try:
-            async with self.session.client("dynamodb", region_name=self.region) as client:
-                await client.describe_table(TableName=self.table_name)
-                return True
+            await self.client.describe_table(TableName=self.table_name)
         except Exception as e:  # noqa: BLE001
             logger.error(f"DynamoDB health check failed: {e}")
-            return False
+            healthy = False
+        else:
+            healthy = True
+        self._health_cache = (now, healthy)
+        return healthy
+
+
+_REPOSITORY_BY_SCHEME: dict[str, type[SQLiteRepository | DynamoDBRepository]] = {
+    "dynamodb": DynamoDBRepository,
+    "sqlite": SQLiteRepository,
+    "sqlite+aiosqlite": SQLiteRepository,
+}
 
 
 def create_repository(database_url: str | None = None) -> Repository:
     """Create repository instance based on database URL."""
-    from .config import settings
-
     if database_url is None:
         url = settings.effective_database_url
         if settings.is_lambda_environment:
@@ -410,21 +970,18 @@ def create_repository(database_url: str | None = None) -> Repository:
     else:
         url = database_url
 
-    parsed = urlparse(url)
+    repository_class = _REPOSITORY_BY_SCHEME.get(urlparse(url).scheme)
+    if repository_class is None:
+        raise StorageError(
+            f"Unsupported database URL scheme: {url}. Must be 'sqlite' or 'dynamodb://'"
+        )
 
-    if parsed.scheme == "dynamodb" or url.startswith("dynamodb://"):
-        logger.info("Creating DynamoDB repository")
-        return DynamoDBRepository(url)
-    if parsed.scheme in ("sqlite", "sqlite+aiosqlite") or url.startswith("sqlite"):
-        logger.info("Creating SQLite repository")
-        return SQLiteRepository(url)
-    raise StorageError(f"Unsupported database URL scheme: {url}. Must be 'sqlite' or 'dynamodb://'")
+    logger.info(f"Creating {repository_class.__name__}")
+    return repository_class(url)
 
 
 def create_cache(redis_url: str | None = None) -> Cache:
     """Create cache instance based on configuration."""
-    from .config import settings
-
     url = redis_url or settings.redis_url
     if url:
         logger.info("Creating Redis cache")
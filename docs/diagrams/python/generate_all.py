@@ -4,6 +4,7 @@
 import os
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Define diagram categories and their files
@@ -35,6 +36,33 @@ DIAGRAM_STRUCTURE = {
 }
 
 
+def render_diagram(category_dir: Path, diagram_file: str) -> tuple[bool, str]:
+    """Run one diagram script in its own directory and report the outcome."""
+    try:
+        # cwd keeps relative paths working without a process-wide chdir,
+        # which would race between scripts rendered in parallel
+        result = subprocess.run(  # noqa: S603
+            [sys.executable, diagram_file],
+            cwd=category_dir,
+            capture_output=True,
+            text=True,
+            timeout=30,
+        )
+    except subprocess.TimeoutExpired:
+        return False, f"  ⏱️  {diagram_file} timed out"
+    except (OSError, ValueError) as e:
+        return False, f"  ❌ {diagram_file} error: {str(e)[:100]}"
+
+    if result.returncode != 0:
+        return False, f"  ❌ {diagram_file} failed: {result.stderr[:100]}"
+
+    # Check if PNG was created
+    png_name = diagram_file.replace(".py", ".png")
+    if not (category_dir / png_name).exists():
+        return False, f"  ⚠️  {diagram_file} ran but no PNG generated"
+    return True, f"  ✅ {diagram_file} → {png_name}"
+
+
 def generate_diagrams():
     """Generate all diagrams in their respective folders."""
     root_dir = Path(__file__).parent
@@ -44,56 +72,41 @@ def generate_diagrams():
     print("🚀 Generating all architecture diagrams...")
     print("=" * 60)
 
-    for category, info in DIAGRAM_STRUCTURE.items():
-        category_dir = root_dir / category
-
-        if not category_dir.exists():
-            print(f"⚠️  Skipping {category}: directory not found")
-            continue
-
-        print(f"\n📁 {category.upper()}: {info['description']}")
-        print("-" * 40)
+    # Each script spends most of its time waiting on its Graphviz subprocess,
+    # so render them all at once and report in category order afterwards
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        renders = {
+            category: {
+                diagram_file: executor.submit(render_diagram, root_dir / category, diagram_file)
+                for diagram_file in info["diagrams"]
+                if (root_dir / category / diagram_file).exists()
+            }
+            for category, info in DIAGRAM_STRUCTURE.items()
+            if (root_dir / category).exists()
+        }
+
+        for category, info in DIAGRAM_STRUCTURE.items():
+            if category not in renders:
+                print(f"⚠️  Skipping {category}: directory not found")
+                continue
 
-        for diagram_file in info["diagrams"]:
-            diagram_path = category_dir / diagram_file
+            print(f"\n📁 {category.upper()}: {info['description']}")
+            print("-" * 40)
 
-            if not diagram_path.exists():
-                print(f"  ❌ {diagram_file} not found")
-                failed.append(f"{category}/{diagram_file}")
-                continue
+            for diagram_file in info["diagrams"]:
+                future = renders[category].get(diagram_file)
+                if future is None:
+                    print(f"  ❌ {diagram_file} not found")
+                    failed.append(f"{category}/{diagram_file}")
+                    continue
 
-            # Change to the diagram's directory to ensure relative paths work
-            original_dir = Path.cwd()
-            os.chdir(category_dir)
-
-            try:
-                # Run the diagram generation
-                result = subprocess.run(  # noqa: S603
-                    [sys.executable, diagram_file], capture_output=True, text=True, timeout=30
-                )
-
-                if result.returncode == 0:
-                    # Check if PNG was created
-                    png_name = diagram_file.replace(".py", ".png")
-                    if (category_dir / png_name).exists():
-                        print(f"  ✅ {diagram_file} → {png_name}")
-                        total_generated += 1
-                    else:
-                        print(f"  ⚠️  {diagram_file} ran but no PNG generated")
-                        failed.append(f"{category}/{diagram_file}")
+                ok, message = future.result()
+                print(message)
+                if ok:
+                    total_generated += 1
                 else:
-                    print(f"  ❌ {diagram_file} failed: {result.stderr[:100]}")
                     failed.append(f"{category}/{diagram_file}")
 
-            except subprocess.TimeoutExpired:
-                print(f"  ⏱️  {diagram_file} timed out")
-                failed.append(f"{category}/{diagram_file}")
-            except (OSError, ValueError) as e:
-                print(f"  ❌ {diagram_file} error: {str(e)[:100]}")
-                failed.append(f"{category}/{diagram_file}")
-            finally:
-                os.chdir(original_dir)
-
     # Summary
     print("\n" + "=" * 60)
     print("✨ Generation Complete!")
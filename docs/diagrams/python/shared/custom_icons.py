@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 """Custom icon system for actual project components."""
 
+from functools import cache
 from pathlib import Path
 
 from diagrams.custom import Custom
 
 
+@cache
 def get_icon_path(name: str) -> str:
-    """Get the absolute path to a PNG icon file."""
+    """Get the absolute path to a PNG icon file.
+
+    Resolved once per name, so icons reused across a diagram skip the
+    filesystem checks and placeholder drawing.
+    """
     # Use absolute path to ensure diagrams can find the icons
     icons_dir = Path(__file__).parent / "icons"
 
@@ -16,7 +22,11 @@ def get_icon_path(name: str) -> str:
     if png_path.exists():
         return str(png_path.absolute())
 
-    # Create placeholder if needed
+    # Reuse a placeholder drawn by an earlier run
+    placeholder_path = icons_dir / f"{name}_placeholder.png"
+    if placeholder_path.exists():
+        return str(placeholder_path.absolute())
+
     return create_placeholder_icon(name)
 
 
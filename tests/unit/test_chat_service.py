@@ -1,5 +1,6 @@
 """Test ChatService core business logic."""
 
+import asyncio
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -7,7 +8,7 @@ import pytest
 from chat_api.chat import ChatService
 from chat_api.exceptions import LLMProviderError, StorageError
 from chat_api.providers import LLMResponse
-from chat_api.storage import cache_key
+from chat_api.storage import cache_key, history_cache_key
 
 
 @pytest.mark.asyncio
@@ -53,7 +54,8 @@ async def test_process_message_cache_miss() -> None:
     assert save_args["model"] == "gemini-1.5-flash"
     assert save_args["usage"] == {"prompt_tokens": 5, "completion_tokens": 10, "total_tokens": 15}
 
-    # Verify cache set
+    # Verify cache set, which runs in the background
+    await service.drain()
     mock_cache.set.assert_called_once()
 
 
@@ -155,6 +157,7 @@ async def test_get_history() -> None:
         },
     ]
     mock_repository.get_history.return_value = history_data
+    mock_cache.get.return_value = None
 
     service = ChatService(mock_repository, mock_cache, mock_llm_provider)
     result = await service.get_history("user123", 10)
@@ -162,6 +165,87 @@ async def test_get_history() -> None:
     assert result == history_data
     mock_repository.get_history.assert_called_once_with("user123", 10)
 
+    await service.drain()
+    mock_cache.set.assert_called_once_with(
+        history_cache_key("user123"), {"limit": 10, "messages": history_data}, 30
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_history_served_from_cache() -> None:
+    """Test a cached history covering the requested limit skips the repository."""
+    mock_repository = AsyncMock()
+    mock_cache = AsyncMock()
+    history_data = [{"id": f"msg-{i}"} for i in range(10)]
+    mock_cache.get.return_value = {"limit": 10, "messages": history_data}
+
+    service = ChatService(mock_repository, mock_cache, AsyncMock())
+
+    assert await service.get_history("user123", 5) == history_data[:5]
+    mock_cache.get.assert_called_once_with(history_cache_key("user123"))
+    mock_repository.get_history.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_history_complete_cached_history_serves_larger_limit() -> None:
+    """Test a cached history shorter than its limit serves any larger limit."""
+    mock_repository = AsyncMock()
+    mock_cache = AsyncMock()
+    history_data = [{"id": "msg-1"}, {"id": "msg-2"}]
+    mock_cache.get.return_value = {"limit": 10, "messages": history_data}
+
+    service = ChatService(mock_repository, mock_cache, AsyncMock())
+
+    assert await service.get_history("user123", 50) == history_data
+    mock_repository.get_history.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_get_history_refetches_beyond_cached_limit() -> None:
+    """Test a request for more messages than were cached goes to the repository."""
+    mock_repository = AsyncMock()
+    mock_cache = AsyncMock()
+    mock_cache.get.return_value = {"limit": 2, "messages": [{"id": "msg-1"}, {"id": "msg-2"}]}
+    history_data = [{"id": f"msg-{i}"} for i in range(5)]
+    mock_repository.get_history.return_value = history_data
+
+    service = ChatService(mock_repository, mock_cache, AsyncMock())
+
+    assert await service.get_history("user123", 10) == history_data
+    mock_repository.get_history.assert_called_once_with("user123", 10)
+
+
+@pytest.mark.asyncio
+async def test_get_history_cache_disabled() -> None:
+    """Test a zero history TTL bypasses the cache entirely."""
+    mock_repository = AsyncMock()
+    mock_cache = AsyncMock()
+    mock_repository.get_history.return_value = []
+
+    service = ChatService(mock_repository, mock_cache, AsyncMock())
+    with patch("chat_api.chat.settings.history_cache_ttl_seconds", 0):
+        assert await service.get_history("user123", 10) == []
+
+    mock_cache.get.assert_not_called()
+    mock_cache.set.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_process_message_invalidates_cached_history() -> None:
+    """Test saving a message drops the user's cached history."""
+    mock_cache = AsyncMock()
+    mock_cache.get.return_value = None
+    mock_llm_provider = AsyncMock()
+    mock_llm_provider.complete.return_value = LLMResponse(
+        text="Hi", model="gemini-1.5-flash", usage=None
+    )
+
+    service = ChatService(AsyncMock(), mock_cache, mock_llm_provider)
+    await service.process_message("user123", "Hello")
+
+    mock_cache.delete.assert_called_once_with(history_cache_key("user123"))
+    await service.drain()
+
 
 @pytest.mark.asyncio
 async def test_health_check_all_healthy() -> None:
@@ -308,3 +392,52 @@ async def test_process_message_cache_key_consistency() -> None:
     second_cache_key = mock_cache.get.call_args_list[1][0][0]
 
     assert first_cache_key == second_cache_key
+
+
+@pytest.mark.asyncio
+async def test_process_message_does_not_wait_for_cache_set() -> None:
+    """Test the response is returned before the cache write completes."""
+    mock_repository = AsyncMock()
+    mock_cache = AsyncMock()
+    mock_llm_provider = AsyncMock()
+
+    mock_cache.get.return_value = None
+    mock_llm_provider.complete.return_value = LLMResponse(
+        text="Response",
+        model="test",
+        usage={"total_tokens": 5},
+    )
+    cache_written = asyncio.Event()
+
+    async def slow_set(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        cache_written.set()
+
+    mock_cache.set.side_effect = slow_set
+
+    service = ChatService(mock_repository, mock_cache, mock_llm_provider)
+    result = await service.process_message("user123", "Hello")
+
+    assert result["content"] == "Response"
+    assert not cache_written.is_set()
+
+    await service.drain()
+    assert cache_written.is_set()
+
+
+@pytest.mark.asyncio
+async def test_process_message_awaits_cache_set_under_lambda() -> None:
+    """Test cache writes complete before returning when running in Lambda."""
+    mock_repository = AsyncMock()
+    mock_cache = AsyncMock()
+    mock_llm_provider = AsyncMock()
+
+    mock_cache.get.return_value = None
+    mock_llm_provider.complete.return_value = LLMResponse(text="Response", model="test", usage=None)
+
+    service = ChatService(mock_repository, mock_cache, mock_llm_provider)
+    with patch.dict("os.environ", {"AWS_LAMBDA_FUNCTION_NAME": "chat-api"}):
+        await service.process_message("user123", "Hello")
+
+    mock_cache.set.assert_awaited_once()
+    assert not service._background_tasks
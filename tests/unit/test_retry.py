@@ -72,3 +72,26 @@ async def test_non_retryable_error():
         await raise_value_error()
 
     assert call_count == 1  # Should not retry
+
+
+@pytest.mark.asyncio
+async def test_retries_exhausted_reraises_last_error():
+    """Test that the last retryable error is raised once attempts run out."""
+    call_count = 0
+
+    @with_llm_retry("TestProvider", max_retries=3, min_wait=0)
+    async def always_fails():
+        nonlocal call_count
+        call_count += 1
+        raise ConnectionError(f"Connection failed {call_count}")
+
+    with pytest.raises(ConnectionError, match="Connection failed 3"):
+        await always_fails()
+
+    assert call_count == 3
+
+
+def test_max_retries_must_allow_one_attempt():
+    """Test a retry budget below one attempt is rejected up front."""
+    with pytest.raises(ValueError, match="max_retries"):
+        with_llm_retry("TestProvider", max_retries=0)
@@ -1,13 +1,19 @@
 """Test storage functionality - SQLite core features only."""
 
+import asyncio
+import sqlite3
 import tempfile
 import time
+from decimal import Decimal
 from pathlib import Path
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 import pytest
 
+from chat_api.exceptions import StorageError
 from chat_api.storage import (
+    _HISTORY_SQL,
     DynamoDBRepository,
     InMemoryCache,
     RedisCache,
@@ -95,6 +101,13 @@ def test_cache_key_generation() -> None:
     assert isinstance(key1, str)
 
 
+def test_cache_key_is_stable_across_processes() -> None:
+    """Test cache keys do not depend on the per-process hash seed."""
+    # Pinned so a switch to hash() or a salted digest is caught: keys must match
+    # across Lambda instances and restarts for the shared Redis cache to hit.
+    assert cache_key("user123", "Hello world") == "user123:d641d955d12c936f"
+
+
 @pytest.mark.asyncio
 async def test_repository_factory() -> None:
     """Test repository factory function."""
@@ -134,13 +147,13 @@ def test_inmemory_cache_set_and_get():
     cache = InMemoryCache()
 
     test_data = {"id": "test-123", "content": "test response"}
-    cache.cache["test-key"] = (test_data, time.time() + 3600)  # 1 hour from now
+    cache.cache["test-key"] = (test_data, time.monotonic() + 3600)  # 1 hour from now
 
     # Directly check cache contents
     assert "test-key" in cache.cache
     data, expiry = cache.cache["test-key"]
     assert data == test_data
-    assert expiry > time.time()  # Should not be expired
+    assert expiry > time.monotonic()  # Should not be expired
 
 
 def test_inmemory_cache_expiry():
@@ -149,20 +162,20 @@ def test_inmemory_cache_expiry():
 
     test_data = {"id": "test-123", "content": "test response"}
     # Set item that's already expired
-    cache.cache["expired-key"] = (test_data, time.time() - 1)  # 1 second ago
+    cache.cache["expired-key"] = (test_data, time.monotonic() - 1)  # 1 second ago
 
     # Check that expired item exists in cache
     assert "expired-key" in cache.cache
 
     # But the get method should handle expiry (when we call it via async methods)
     data, expiry = cache.cache["expired-key"]
-    assert expiry < time.time()  # Should be expired
+    assert expiry < time.monotonic()  # Should be expired
 
 
 def test_cache_clear():
     """Test cache clearing."""
     cache = InMemoryCache()
-    cache.cache["test-key"] = ({"test": "data"}, time.time() + 3600)
+    cache.cache["test-key"] = ({"test": "data"}, time.monotonic() + 3600)
 
     assert len(cache.cache) == 1
     cache.cache.clear()
@@ -174,18 +187,21 @@ async def test_inmemory_cache_startup():
     """Test InMemoryCache startup - covers lines 76-78."""
     cache = InMemoryCache()
 
-    # startup does nothing but should be callable
     await cache.startup()
 
-    # Cache should still be empty
+    # Cache should still be empty, with the reaper running
     assert cache.cache == {}
+    assert cache._reaper_task is not None
+
+    await cache.shutdown()
+    assert cache._reaper_task is None
 
 
 @pytest.mark.asyncio
 async def test_inmemory_cache_shutdown():
     """Test InMemoryCache shutdown - covers lines 88-90."""
     cache = InMemoryCache()
-    cache.cache["test"] = ({"data": "test"}, time.time() + 3600)
+    cache.cache["test"] = ({"data": "test"}, time.monotonic() + 3600)
 
     assert len(cache.cache) == 1
 
@@ -211,7 +227,7 @@ async def test_inmemory_cache_get_expired():
     cache = InMemoryCache()
 
     # Add expired item
-    cache.cache["expired"] = ({"data": "old"}, time.time() - 1)
+    cache.cache["expired"] = ({"data": "old"}, time.monotonic() - 1)
 
     result = await cache.get("expired")
 
@@ -226,7 +242,7 @@ async def test_inmemory_cache_get_valid():
     cache = InMemoryCache()
 
     test_data = {"data": "valid"}
-    cache.cache["valid"] = (test_data, time.time() + 3600)
+    cache.cache["valid"] = (test_data, time.monotonic() + 3600)
 
     result = await cache.get("valid")
 
@@ -245,7 +261,20 @@ async def test_inmemory_cache_set():
     assert "test_key" in cache.cache
     stored_data, expiry = cache.cache["test_key"]
     assert stored_data == test_data
-    assert expiry > time.time()
+    assert expiry > time.monotonic()
+
+
+@pytest.mark.asyncio
+async def test_inmemory_cache_delete():
+    """Test InMemoryCache delete removes the key and tolerates missing keys."""
+    cache = InMemoryCache()
+    await cache.set("test_key", {"id": "123"})
+
+    await cache.delete("test_key")
+    await cache.delete("missing")
+
+    assert await cache.get("test_key") is None
+    assert cache.reap_expired() == 0
 
 
 @pytest.mark.asyncio
@@ -270,6 +299,35 @@ async def test_inmemory_cache_set_eviction():
     assert "key3" in cache.cache
 
 
+@pytest.mark.asyncio
+async def test_inmemory_cache_evicts_least_recently_used():
+    """Test a cache hit protects an entry from the next eviction."""
+    cache = InMemoryCache(max_size=2)
+
+    await cache.set("key1", {"data": 1}, ttl=3600)
+    await cache.set("key2", {"data": 2}, ttl=3600)
+    await cache.get("key1")
+    await cache.set("key3", {"data": 3}, ttl=3600)
+
+    assert list(cache.cache) == ["key1", "key3"]
+
+
+@pytest.mark.asyncio
+async def test_inmemory_cache_reap_expired():
+    """Test reaping drops expired entries and ignores superseded expiries."""
+    cache = InMemoryCache()
+
+    await cache.set("short", {"data": 1}, ttl=1)
+    await cache.set("long", {"data": 2}, ttl=3600)
+    await cache.set("renewed", {"data": 3}, ttl=1)
+    await cache.set("renewed", {"data": 4}, ttl=3600)
+
+    with patch("chat_api.storage._monotonic", return_value=time.monotonic() + 5):
+        assert cache.reap_expired() == 1
+
+    assert list(cache.cache) == ["long", "renewed"]
+
+
 @pytest.mark.asyncio
 async def test_redis_cache_startup_success():
     """Test RedisCache successful startup - covers lines 111-113, 117-119."""
@@ -282,7 +340,10 @@ async def test_redis_cache_startup_success():
         await cache.startup()
 
         # Should have created client and pinged
-        mock_from_url.assert_called_once_with("redis://localhost:6379")
+        mock_from_url.assert_called_once()
+        assert mock_from_url.call_args.args == ("redis://localhost:6379",)
+        assert mock_from_url.call_args.kwargs["max_connections"] == 64
+        assert mock_from_url.call_args.kwargs["socket_keepalive"] is True
         mock_client.ping.assert_called_once()
         assert cache.client == mock_client
 
@@ -314,11 +375,11 @@ async def test_redis_cache_shutdown():
     cache.client = mock_client
 
     await cache.shutdown()
-    mock_client.close.assert_called_once()
+    mock_client.aclose.assert_called_once()
 
     # Test shutdown with client that fails
     mock_client_fail = AsyncMock()
-    mock_client_fail.close.side_effect = ConnectionError("Close failed")
+    mock_client_fail.aclose.side_effect = ConnectionError("Close failed")
     cache.client = mock_client_fail
 
     # Should not raise, just log warning
@@ -387,7 +448,7 @@ async def test_redis_cache_set():
     call_args = mock_client.setex.call_args[0]
     assert call_args[0] == "test_key"
     assert call_args[1] == 3600
-    assert '"id": "123"' in call_args[2]
+    assert orjson.loads(call_args[2]) == test_data
 
 
 @pytest.mark.asyncio
@@ -419,6 +480,21 @@ async def test_redis_cache_set_serialization_error():
         await cache.set("test_key", {"obj": NonSerializable()}, ttl=3600)
 
 
+@pytest.mark.asyncio
+async def test_redis_cache_delete_clears_l1():
+    """Test RedisCache delete removes the key from Redis and the local L1."""
+    cache = RedisCache("redis://localhost:6379")
+    mock_client = AsyncMock()
+    mock_client.get.return_value = None
+    cache.client = mock_client
+
+    await cache.set("test_key", {"id": "123"})
+    await cache.delete("test_key")
+
+    mock_client.delete.assert_called_once_with("test_key")
+    assert await cache.get("test_key") is None
+
+
 def test_create_cache_no_redis():
     """Test create_cache without Redis URL - covers line 411."""
     cache = create_cache()
@@ -440,9 +516,558 @@ def test_create_repository_sqlite():
     assert isinstance(repo, SQLiteRepository)
 
 
+def test_create_repository_unsupported_scheme():
+    """Test create_repository rejects URL schemes without a backend."""
+    with pytest.raises(StorageError, match="Unsupported database URL scheme"):
+        create_repository("postgresql://localhost/chat")
+
+
 def test_create_repository_dynamodb():
     """Test create_repository with DynamoDB URL - covers lines 421-422."""
     repo = create_repository("dynamodb://test-table?region=us-east-1")
     assert isinstance(repo, DynamoDBRepository)
     assert repo.table_name == "test-table"
     assert repo.region == "us-east-1"
+
+
+@pytest.mark.asyncio
+async def test_dynamodb_save_and_history_roundtrip():
+    """Test DynamoDB items are serialized on save and deserialized on read."""
+    mock_client = AsyncMock()
+    mock_client.batch_write_item.return_value = {}
+    repo = await _started_dynamodb_repo(mock_client)
+
+    await repo.save(
+        id="msg-1",
+        user_id="user123",
+        content="Hello",
+        response="Hi there!",
+        model="test-model",
+    )
+
+    request_items = mock_client.batch_write_item.call_args.kwargs["RequestItems"]
+    item = request_items["test-table"][0]["PutRequest"]["Item"]
+    assert item["id"] == {"S": "msg-1"}
+    assert item["user_id"] == {"S": "user123"}
+    assert "usage" not in item  # None values are skipped
+
+    mock_client.query.return_value = {"Items": [item]}
+    history = await repo.get_history("user123", 10)
+
+    assert len(history) == 1
+    assert history[0]["id"] == "msg-1"
+    assert history[0]["response"] == "Hi there!"
+    assert history[0]["timestamp"]
+
+
+@pytest.mark.asyncio
+async def test_dynamodb_usage_attribute_roundtrip():
+    """Test nested usage values map to DynamoDB attribute types and back."""
+    mock_client = AsyncMock()
+    mock_client.batch_write_item.return_value = {}
+    repo = await _started_dynamodb_repo(mock_client)
+
+    usage = {"total_tokens": 12, "cost_usd": 0.25, "cached": True, "details": {"ids": ["a", None]}}
+    await repo.save(id="msg-1", user_id="user123", content="Hi", response="Hello", usage=usage)
+
+    request_items = mock_client.batch_write_item.call_args.kwargs["RequestItems"]
+    item = request_items["test-table"][0]["PutRequest"]["Item"]
+    assert item["usage"] == {
+        "M": {
+            "total_tokens": {"N": "12"},
+            "cost_usd": {"N": "0.25"},
+            "cached": {"BOOL": True},
+            "details": {"M": {"ids": {"L": [{"S": "a"}, {"NULL": True}]}}},
+        }
+    }
+
+    mock_client.query.return_value = {"Items": [item]}
+    history = await repo.get_history("user123", 10)
+    assert history[0]["usage"] == {
+        "total_tokens": 12,
+        "cost_usd": 0.25,
+        "cached": True,
+        "details": {"ids": ["a", None]},
+    }
+    assert type(history[0]["usage"]["total_tokens"]) is int
+    assert type(history[0]["usage"]["cost_usd"]) is float
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_usage_roundtrip() -> None:
+    """Test token usage, including Decimal cost, survives a save and reload."""
+    repo = SQLiteRepository("sqlite+aiosqlite:///:memory:")
+    await repo.startup()
+
+    usage = {"prompt_tokens": 5, "total_tokens": 12, "cost_usd": Decimal("0.0001")}
+    await repo.save(id="msg-1", user_id="test_user", content="Hi", response="Hello", usage=usage)
+    await repo.save(id="msg-2", user_id="test_user", content="Hi", response="Hello", usage=usage)
+
+    history = await repo.get_history("test_user", 10)
+    assert len(history) == 2
+    assert history[0]["usage"] == {"prompt_tokens": 5, "total_tokens": 12, "cost_usd": "0.0001"}
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_usage_keeps_value_types_distinct() -> None:
+    """Test equal usage values of different types are stored as given."""
+    repo = SQLiteRepository("sqlite+aiosqlite:///:memory:")
+    await repo.startup()
+
+    await repo.save(id="m1", user_id="test_user", content="a", response="b", usage={"n": True})
+    await repo.save(id="m2", user_id="test_user", content="a", response="b", usage={"n": 1})
+
+    usages = {record["id"]: record["usage"] for record in await repo.get_history("test_user")}
+    assert usages["m1"] == {"n": True}
+    assert usages["m1"]["n"] is True
+    assert usages["m2"]["n"] == 1
+    assert usages["m2"]["n"] is not True
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_usage_with_nested_details() -> None:
+    """Test usage with nested token details is saved and reloaded."""
+    repo = SQLiteRepository("sqlite+aiosqlite:///:memory:")
+    await repo.startup()
+
+    usage = {"total_tokens": 12, "prompt_tokens_details": {"cached_tokens": 4}}
+    await repo.save(id="m1", user_id="test_user", content="a", response="b", usage=usage)
+
+    history = await repo.get_history("test_user")
+    assert history[0]["usage"] == usage
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_dynamodb_client_reused_and_closed():
+    """Test DynamoDB opens one client at startup and closes it on shutdown."""
+    mock_client = AsyncMock()
+    mock_client.batch_write_item.return_value = {}
+    mock_session = _mock_dynamodb_session(mock_client)
+    client_cm = mock_session.create_client.return_value
+    repo = await _started_dynamodb_repo(mock_client, mock_session)
+
+    await repo.save(id="msg-1", user_id="user123", content="Hi", response="Hello")
+    mock_client.query.return_value = {"Items": []}
+    await repo.get_history("user123", 10)
+    assert await repo.health_check() is True
+
+    mock_session.create_client.assert_called_once()
+    assert mock_session.create_client.call_args.kwargs["region_name"] == "us-east-1"
+    assert mock_session.create_client.call_args.kwargs["config"].max_pool_connections == 50
+    assert mock_session.create_client.call_args.kwargs["config"].retries["mode"] == "adaptive"
+
+    await repo.shutdown()
+    client_cm.__aexit__.assert_called_once()
+    assert await repo.health_check() is False
+
+
+@pytest.mark.asyncio
+async def test_dynamodb_failed_startup_closes_client():
+    """Test the client is closed when table creation fails during startup."""
+    mock_client = AsyncMock()
+    mock_client.describe_table.side_effect = Exception("ResourceNotFoundException")
+    mock_client.create_table.side_effect = ConnectionError("DynamoDB unavailable")
+    mock_session = _mock_dynamodb_session(mock_client)
+    client_cm = mock_session.create_client.return_value
+
+    repo = DynamoDBRepository("dynamodb://test-table?region=us-east-1")
+    with (
+        patch("aiobotocore.session.get_session", return_value=mock_session),
+        pytest.raises(ConnectionError),
+    ):
+        await repo.startup()
+
+    client_cm.__aexit__.assert_called_once()
+    assert repo.client is None
+
+
+def _mock_dynamodb_session(mock_client: AsyncMock) -> MagicMock:
+    """Create an aiobotocore session mock whose client context yields mock_client."""
+    mock_session = MagicMock()
+    mock_session.create_client.return_value.__aenter__.return_value = mock_client
+    return mock_session
+
+
+async def _started_dynamodb_repo(
+    mock_client: AsyncMock, mock_session: MagicMock | None = None
+) -> DynamoDBRepository:
+    """Create a DynamoDB repository started against a mocked client."""
+    mock_session = mock_session or _mock_dynamodb_session(mock_client)
+
+    with patch("aiobotocore.session.get_session", return_value=mock_session):
+        repo = DynamoDBRepository("dynamodb://test-table?region=us-east-1")
+        await repo.startup()
+    return repo
+
+
+@pytest.mark.asyncio
+async def test_dynamodb_concurrent_saves_are_batched():
+    """Test concurrent DynamoDB saves share one BatchWriteItem call."""
+    mock_client = AsyncMock()
+    mock_client.batch_write_item.return_value = {}
+    repo = await _started_dynamodb_repo(mock_client)
+
+    await asyncio.gather(
+        *(
+            repo.save(id=f"msg-{i}", user_id=f"user{i}", content="Hi", response="Hello")
+            for i in range(3)
+        )
+    )
+
+    mock_client.batch_write_item.assert_called_once()
+    request_items = mock_client.batch_write_item.call_args.kwargs["RequestItems"]
+    assert len(request_items["test-table"]) == 3
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_dynamodb_unprocessed_items_are_retried():
+    """Test items DynamoDB leaves unprocessed are written on a retry."""
+    mock_client = AsyncMock()
+    repo = await _started_dynamodb_repo(mock_client)
+
+    unprocessed = {"test-table": [{"PutRequest": {"Item": {"id": {"S": "msg-1"}}}}]}
+    mock_client.batch_write_item.side_effect = [
+        {"UnprocessedItems": unprocessed},
+        {},
+    ]
+
+    await repo.save(id="msg-1", user_id="user123", content="Hi", response="Hello")
+
+    assert mock_client.batch_write_item.call_count == 2
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_dynamodb_save_failure_raises_storage_error():
+    """Test a failed batch write surfaces as StorageError to the caller."""
+    mock_client = AsyncMock()
+    mock_client.batch_write_item.side_effect = ConnectionError("DynamoDB unavailable")
+    repo = await _started_dynamodb_repo(mock_client)
+
+    with pytest.raises(StorageError, match="DynamoDB unavailable"):
+        await repo.save(id="msg-1", user_id="user123", content="Hi", response="Hello")
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_dynamodb_rejected_item_fails_only_its_save():
+    """Test a batch-level rejection is retried per item so other saves succeed."""
+    mock_client = AsyncMock()
+    mock_client.batch_write_item.side_effect = Exception("ValidationException: item too large")
+
+    async def put_item(**kwargs):
+        if kwargs["Item"]["id"]["S"] == "msg-big":
+            raise ValueError("ValidationException: item too large")
+        return {}
+
+    mock_client.put_item.side_effect = put_item
+    repo = await _started_dynamodb_repo(mock_client)
+
+    results = await asyncio.gather(
+        repo.save(id="msg-big", user_id="user0", content="Hi", response="x" * 10),
+        repo.save(id="msg-1", user_id="user1", content="Hi", response="Hello"),
+        repo.save(id="msg-2", user_id="user2", content="Hi", response="Hello"),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], StorageError)
+    assert results[1:] == [None, None]
+    mock_client.batch_write_item.assert_called_once()
+    assert mock_client.put_item.call_count == 3
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_dynamodb_slow_batch_does_not_block_next():
+    """Test a batch still in flight does not delay the saves queued after it."""
+    mock_client = AsyncMock()
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def batch_write_item(**kwargs):
+        if kwargs["RequestItems"]["test-table"][0]["PutRequest"]["Item"]["id"]["S"] == "msg-1":
+            started.set()
+            await release.wait()
+        return {}
+
+    mock_client.batch_write_item.side_effect = batch_write_item
+    repo = await _started_dynamodb_repo(mock_client)
+
+    slow = asyncio.create_task(
+        repo.save(id="msg-1", user_id="user1", content="Hi", response="Hello")
+    )
+    await started.wait()
+
+    await asyncio.wait_for(
+        repo.save(id="msg-2", user_id="user2", content="Hi", response="Hello"), timeout=1
+    )
+    assert not slow.done()
+
+    release.set()
+    await slow
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_dynamodb_duplicate_keys_split_batches():
+    """Test items sharing a primary key are never sent in the same batch."""
+    mock_client = AsyncMock()
+    mock_client.batch_write_item.return_value = {}
+    repo = await _started_dynamodb_repo(mock_client)
+
+    with patch("chat_api.storage.time.time_ns", return_value=1_700_000_000_000_000_000):
+        await asyncio.gather(
+            repo.save(id="msg-1", user_id="user123", content="Hi", response="Hello"),
+            repo.save(id="msg-2", user_id="user123", content="Hi", response="Hello"),
+        )
+
+    assert mock_client.batch_write_item.call_count == 2
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_dynamodb_history_follows_pages():
+    """Test get_history keeps querying until the limit is met or pages run out."""
+    mock_client = AsyncMock()
+    repo = await _started_dynamodb_repo(mock_client)
+
+    def item(message_id: str) -> dict:
+        return {"id": {"S": message_id}, "user_id": {"S": "user123"}, "timestamp": {"N": "1"}}
+
+    mock_client.query.side_effect = [
+        {"Items": [item("msg-1")], "LastEvaluatedKey": {"user_id": {"S": "user123"}}},
+        {"Items": [item("msg-2")]},
+    ]
+
+    history = await repo.get_history("user123", 5)
+
+    assert [record["id"] for record in history] == ["msg-1", "msg-2"]
+    second_call = mock_client.query.call_args_list[1].kwargs
+    assert second_call["ExclusiveStartKey"] == {"user_id": {"S": "user123"}}
+    assert second_call["Limit"] == 4
+    assert second_call["ProjectionExpression"] == (
+        "#id, #user_id, #content, #response, #model, #usage, #timestamp"
+    )
+    assert second_call["ExpressionAttributeNames"]["#timestamp"] == "timestamp"
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_l1_serves_repeat_gets():
+    """Test repeated Redis gets within the L1 TTL skip the network."""
+    cache = RedisCache("redis://localhost:6379")
+    mock_client = AsyncMock()
+    mock_client.get.return_value = b'{"id": "123"}'
+    cache.client = mock_client
+
+    assert await cache.get("hot_key") == {"id": "123"}
+    assert await cache.get("hot_key") == {"id": "123"}
+    mock_client.get.assert_called_once_with("hot_key")
+
+    # Expired L1 entries fall through to Redis again
+    with patch("chat_api.storage._monotonic", return_value=time.monotonic() + 5):
+        await cache.get("hot_key")
+    assert mock_client.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_l1_hits_return_independent_dicts():
+    """Test callers mutating an L1 hit do not affect each other or the cached value."""
+    cache = RedisCache("redis://localhost:6379")
+    cache.client = AsyncMock()
+
+    value = {"id": "123"}
+    await cache.set("key", value, ttl=60)
+    value["id"] = "changed"
+
+    first = await cache.get("key")
+    assert first is not None
+    first["cached"] = True
+
+    assert await cache.get("key") == {"id": "123"}
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_set_refreshes_l1():
+    """Test a Redis set makes the new value visible to the next get."""
+    cache = RedisCache("redis://localhost:6379")
+    mock_client = AsyncMock()
+    cache.client = mock_client
+
+    await cache.set("key", {"id": "new"}, ttl=60)
+
+    assert await cache.get("key") == {"id": "new"}
+    mock_client.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_file_database_uses_wal(tmp_path: Path) -> None:
+    """Test file-backed SQLite databases use WAL journaling and memory-mapped I/O."""
+    repo = SQLiteRepository(f"sqlite+aiosqlite:///{tmp_path / 'chat.db'}")
+    await repo.startup()
+
+    assert repo.connection is not None
+    async with repo.connection.execute("PRAGMA journal_mode") as cursor:
+        row = await cursor.fetchone()
+    assert row is not None
+    assert row[0] == "wal"
+
+    async with repo.connection.execute("PRAGMA synchronous") as cursor:
+        row = await cursor.fetchone()
+    assert row is not None
+    assert row[0] == 1  # NORMAL
+
+    async with repo.connection.execute("PRAGMA mmap_size") as cursor:
+        row = await cursor.fetchone()
+    assert row is not None
+    assert row[0] == 268435456
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_concurrent_saves_share_one_commit() -> None:
+    """Test concurrent SQLite saves are inserted in a single transaction."""
+    repo = SQLiteRepository("sqlite+aiosqlite:///:memory:")
+    await repo.startup()
+
+    assert repo.connection is not None
+    commit = repo.connection.commit
+    commits = 0
+
+    async def counting_commit() -> None:
+        nonlocal commits
+        commits += 1
+        await commit()
+
+    repo.connection.commit = counting_commit  # type: ignore[method-assign]
+
+    await asyncio.gather(
+        *(
+            repo.save(id=f"msg-{i}", user_id="test_user", content="Hi", response="Hello")
+            for i in range(5)
+        )
+    )
+
+    assert commits == 1
+    assert len(await repo.get_history("test_user", 10)) == 5
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_duplicate_id_fails_only_its_save() -> None:
+    """Test a row rejected inside a batch does not fail the other saves."""
+    repo = SQLiteRepository("sqlite+aiosqlite:///:memory:")
+    await repo.startup()
+    await repo.save(id="msg-0", user_id="test_user", content="Hi", response="Hello")
+
+    results = await asyncio.gather(
+        repo.save(id="msg-1", user_id="test_user", content="Hi", response="Hello"),
+        repo.save(id="msg-0", user_id="test_user", content="Hi", response="Again"),
+        repo.save(id="msg-2", user_id="test_user", content="Hi", response="Hello"),
+        return_exceptions=True,
+    )
+
+    assert results[0] is None
+    assert isinstance(results[1], sqlite3.IntegrityError)
+    assert results[2] is None
+    assert len(await repo.get_history("test_user", 10)) == 3
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_history_uses_covering_index() -> None:
+    """Test the history query is served from the covering index alone."""
+    repo = SQLiteRepository("sqlite+aiosqlite:///:memory:")
+    await repo.startup()
+
+    assert repo.connection is not None
+    async with repo.connection.execute(
+        f"EXPLAIN QUERY PLAN {_HISTORY_SQL}", ("test_user", 10)
+    ) as cursor:
+        plan = " ".join(row[-1] for row in await cursor.fetchall())
+    assert "USING COVERING INDEX idx_history_cover" in plan
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_page_cache_is_enlarged() -> None:
+    """Test the SQLite page cache and temp store pragmas apply to every database."""
+    repo = SQLiteRepository("sqlite+aiosqlite:///:memory:")
+    await repo.startup()
+
+    assert repo.connection is not None
+    async with repo.connection.execute("PRAGMA cache_size") as cursor:
+        row = await cursor.fetchone()
+    assert row is not None
+    assert row[0] == -64000
+
+    async with repo.connection.execute("PRAGMA temp_store") as cursor:
+        row = await cursor.fetchone()
+    assert row is not None
+    assert row[0] == 2  # MEMORY
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_dynamodb_health_check_is_cached():
+    """Test repeated DynamoDB health probes reuse the last DescribeTable result."""
+    mock_client = AsyncMock()
+    repo = await _started_dynamodb_repo(mock_client)
+    mock_client.describe_table.reset_mock()
+
+    assert await repo.health_check() is True
+    assert await repo.health_check() is True
+    mock_client.describe_table.assert_called_once()
+
+    mock_client.describe_table.side_effect = Exception("throttled")
+    with patch("chat_api.storage._monotonic", return_value=time.monotonic() + 60):
+        assert await repo.health_check() is False
+    assert mock_client.describe_table.call_count == 2
+
+    await repo.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_concurrent_gets_share_one_mget():
+    """Test lookups overlapping an in-flight GET are coalesced into one MGET."""
+    cache = RedisCache("redis://localhost:6379")
+    mock_client = AsyncMock()
+
+    async def slow_get(key):
+        await asyncio.sleep(0.01)
+        return orjson.dumps({"key": key})
+
+    mock_client.get.side_effect = slow_get
+    mock_client.mget.return_value = [orjson.dumps({"n": 1}), None]
+    cache.client = mock_client
+
+    lone, first, missing, duplicate = await asyncio.gather(
+        cache.get("key-0"), cache.get("key-1"), cache.get("key-2"), cache.get("key-1")
+    )
+
+    assert lone == {"key": "key-0"}
+    assert first == {"n": 1}
+    assert duplicate == {"n": 1}
+    assert missing is None
+    mock_client.get.assert_called_once_with("key-0")
+    mock_client.mget.assert_called_once_with(["key-1", "key-2"])